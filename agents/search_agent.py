@@ -3,9 +3,11 @@ Multi-LLM Search Agent
 Main agent that combines search and LLM capabilities
 """
 from typing import Dict, Optional
+from config import settings
 from config.api_config import APIConfig
 from utils.search_engine import SearchEngine
 from utils.llm_handler import LLMHandler
+from utils.full_text import select_chunks
 
 class SearchAgent:
     """Multi-LLM search agent for arxiv and Wikipedia"""
@@ -74,19 +76,26 @@ class SearchAgent:
         if search_results['arxiv']:
             context_parts.append("## ARXIV PAPERS:")
             for i, paper in enumerate(search_results['arxiv'], 1):
-                context_parts.append(f"\n{i}. {paper['title']}")
-                context_parts.append(f"   Authors: {', '.join(paper['authors'][:3])}")
-                context_parts.append(f"   Published: {paper['published']}")
-                context_parts.append(f"   Summary: {paper['summary'][:300]}...")
-                context_parts.append(f"   URL: {paper['url']}")
+                context_parts.append(f"\n{i}. {paper.title}")
+                context_parts.append(f"   Authors: {', '.join(paper.authors[:3])}")
+                context_parts.append(f"   Published: {paper.published}")
+                context_parts.append(f"   Summary: {paper.summary[:300]}...")
+                context_parts.append(f"   URL: {paper.url}")
+                excerpts = select_chunks(
+                    paper.chunks,
+                    search_results['query'],
+                    settings.FULL_TEXT_CONTEXT_CHUNKS
+                )
+                for chunk in excerpts:
+                    context_parts.append(f"   Excerpt: {chunk}")
         
         # Add Wikipedia results
         if search_results['wikipedia']:
             context_parts.append("\n## WIKIPEDIA ARTICLES:")
             for i, article in enumerate(search_results['wikipedia'], 1):
-                context_parts.append(f"\n{i}. {article['title']}")
-                context_parts.append(f"   {article['body'][:200]}...")
-                context_parts.append(f"   URL: {article['url']}")
+                context_parts.append(f"\n{i}. {article.title}")
+                context_parts.append(f"   {article.body[:200]}...")
+                context_parts.append(f"   URL: {article.url}")
         
         return "\n".join(context_parts)
     
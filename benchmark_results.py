@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Benchmark search result representations
+
+Compares the plain dict + JSON path against the slotted result classes
+with binary serialization, for memory per result and encode/decode
+throughput. Uses synthetic arxiv records, so no network access is needed.
+"""
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+
+from utils import results as result_model
+from utils.results import Paper
+
+NUM_RESULTS = 2000
+ROUNDS = 5
+
+
+def make_records(count: int) -> list:
+    """Build synthetic records shaped like arxiv.Result"""
+    return [
+        SimpleNamespace(
+            title=f"Sparse Attention Mechanisms for Long Document Retrieval {i}",
+            authors=[SimpleNamespace(name=f"Author {i}-{j}") for j in range(8)],
+            published=datetime(2024, 1 + i % 12, 1 + i % 28),
+            summary=("We study attention mechanisms for long documents. " * 25).strip(),
+            entry_id=f"http://arxiv.org/abs/2401.{i:05d}v1"
+        )
+        for i in range(count)
+    ]
+
+
+def to_legacy_dict(paper) -> dict:
+    """The dict representation previously built by SearchEngine.search_arxiv"""
+    return {
+        'title': paper.title,
+        'authors': [author.name for author in paper.authors][:3],
+        'published': paper.published.strftime('%Y-%m-%d'),
+        'summary': paper.summary[:300],
+        'url': paper.entry_id,
+        'source': 'arxiv'
+    }
+
+
+def measure_memory(build) -> float:
+    """
+    Return bytes still allocated per result after build() returns
+
+    build() should create its source records itself, so that records kept
+    alive by the results are counted and records it releases are not.
+    """
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(built)
+
+
+def build_legacy_dicts() -> list:
+    """Old path: truncated dicts, source records are released"""
+    return [to_legacy_dict(record) for record in make_records(NUM_RESULTS)]
+
+
+def build_full_dicts() -> list:
+    """Dicts holding the same full fields as a formatted paper"""
+    return [Paper.from_arxiv(record).to_dict() for record in make_records(NUM_RESULTS)]
+
+
+def build_papers() -> list:
+    """New path before any field is read: each paper keeps its record"""
+    return [Paper.from_arxiv(record) for record in make_records(NUM_RESULTS)]
+
+
+def build_formatted_papers() -> list:
+    """New path after context formatting, which reads every field and so
+    releases the record"""
+    papers = build_papers()
+    for paper in papers:
+        paper.title, paper.authors, paper.published, paper.summary, paper.url
+    return papers
+
+
+def measure_throughput(func) -> float:
+    """Return results per second for func(), best of ROUNDS"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return NUM_RESULTS / best
+
+
+def main():
+    """Run the benchmark and print a comparison table"""
+    records = make_records(NUM_RESULTS)
+
+    # Both serialization paths carry the same full fields
+    papers = [Paper.from_arxiv(record) for record in records]
+    dicts = [paper.to_dict() for paper in papers]
+    json_data = json.dumps(dicts)
+    binary_data = result_model.dumps(papers)
+
+    legacy_memory = measure_memory(build_legacy_dicts)
+    rows = [
+        ("Retained, unread (per result)",
+         f"{legacy_memory:.0f} B",
+         f"{measure_memory(build_papers):.0f} B"),
+        ("Retained, formatted (per result)",
+         f"{legacy_memory:.0f} B",
+         f"{measure_memory(build_formatted_papers):.0f} B"),
+        ("  same full fields (per result)",
+         f"{measure_memory(build_full_dicts):.0f} B",
+         f"{measure_memory(build_formatted_papers):.0f} B"),
+        ("Decoded (per result)",
+         f"{measure_memory(lambda: json.loads(json_data)):.0f} B",
+         f"{measure_memory(lambda: result_model.loads(binary_data)):.0f} B"),
+        ("Encoded size (per result)",
+         f"{len(json_data.encode('utf-8')) / NUM_RESULTS:.0f} B",
+         f"{len(binary_data) / NUM_RESULTS:.0f} B"),
+        ("Encode (results/s)",
+         f"{measure_throughput(lambda: json.dumps(dicts)):,.0f}",
+         f"{measure_throughput(lambda: result_model.dumps(papers)):,.0f}"),
+        ("Decode (results/s)",
+         f"{measure_throughput(lambda: json.loads(json_data)):,.0f}",
+         f"{measure_throughput(lambda: result_model.loads(binary_data)):,.0f}"),
+    ]
+
+    print("=" * 60)
+    print("Search Result Benchmark")
+    print("=" * 60)
+    print(f"Results: {NUM_RESULTS}, best of {ROUNDS} rounds")
+    print("Retained rows compare the old truncated dicts with results. Unread")
+    print("results keep their source record alive; formatting reads every field,")
+    print("which releases it. Formatted results hold the full abstract and all")
+    print("authors, so they are also compared with dicts of the same fields.")
+    print("Encode/decode rows use the same full fields both ways.")
+    print()
+    print(f"{'':34}{'dict + JSON':>14}{'slots + binary':>16}")
+    for label, baseline, slotted in rows:
+        print(f"{label:34}{baseline:>14}{slotted:>16}")
+
+
+if __name__ == "__main__":
+    main()
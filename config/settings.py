@@ -13,6 +13,14 @@ GOOGLE_API_KEY = None  # Set to your Google API key or use input prompt
 ARXIV_MAX_RESULTS = 3  # Maximum number of arxiv papers to search
 WIKIPEDIA_MAX_RESULTS = 3  # Maximum number of Wikipedia articles to search
 
+# Full Text Configuration
+FULL_TEXT_ENABLED = False  # Download and chunk full text of the top arxiv papers
+FULL_TEXT_TOP_N = 2  # Number of arxiv papers to fetch full text for
+FULL_TEXT_CACHE_DIR = ".cache/full_text"  # On-disk cache for downloads and chunks
+FULL_TEXT_CHUNK_SIZE = 1500  # Maximum characters per chunk
+FULL_TEXT_CHUNK_OVERLAP = 200  # Characters shared between consecutive chunks
+FULL_TEXT_CONTEXT_CHUNKS = 3  # Chunks per paper included in the LLM context
+
 # LLM Configuration
 GROQ_MODEL = "llama-3.3-70b-versatile"  # Groq model to use (automatically falls back to llama-3.1-8b-instant if unavailable)
 TEMPERATURE = 0.7  # Temperature for response generation (0-1)
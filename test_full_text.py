@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""Test script for the arxiv full text pipeline
+
+Serves generated arxiv downloads from a temporary directory with a local
+HTTP server, so no network access is needed. Run directly or with pytest.
+"""
+import functools
+import glob
+import gzip
+import io
+import os
+import tarfile
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.full_text import FullTextFetcher, chunk_text
+
+MAIN_TEX = r"""\documentclass{article}
+\begin{document}
+\begin{abstract}Sparse attention for long documents.\end{abstract}
+\input{sections/intro}
+\input{sections/method}
+\end{document}
+"""
+INTRO_TEX = r"\section{Introduction}Long documents need efficient attention."
+METHOD_TEX = r"\section{Method}Our method uses \emph{sparse} attention kernels."
+
+
+def _make_tarball(files: dict) -> bytes:
+    """Build a gzipped tarball like an arxiv e-print"""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tar:
+        for name, content in files.items():
+            data = content.encode('utf-8')
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class _StubServer:
+    """Local file server that records the paths it was asked for"""
+
+    def __init__(self, root: str):
+        self.requests = []
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                super().do_GET()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(
+            ('127.0.0.1', 0), functools.partial(Handler, directory=root)
+        )
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _setup(tmp_dir: str):
+    """Write stub downloads and return (server, fetcher)"""
+    serve_dir = os.path.join(tmp_dir, 'serve', 'e-print')
+    os.makedirs(serve_dir)
+    with open(os.path.join(serve_dir, '2101.00001v2'), 'wb') as f:
+        f.write(_make_tarball({
+            'main.tex': MAIN_TEX,
+            'sections/intro.tex': INTRO_TEX,
+            'sections/method.tex': METHOD_TEX,
+        }))
+    with open(os.path.join(serve_dir, '2101.00002v1'), 'wb') as f:
+        f.write(gzip.compress(b"\\begin{document}Single file paper.\\end{document}"))
+
+    server = _StubServer(os.path.join(tmp_dir, 'serve'))
+    fetcher = FullTextFetcher(
+        os.path.join(tmp_dir, 'cache'),
+        source_url=server.url + "/e-print/{arxiv_id}",
+        pdf_url=server.url + "/pdf/{arxiv_id}",
+        chunk_size=200,
+        overlap=20
+    )
+    return server, fetcher
+
+
+def test_fetch_chunks_and_cache():
+    """Multi-file sources are inlined, and repeated papers hit the cache"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        server, fetcher = _setup(tmp_dir)
+        try:
+            urls = ['http://arxiv.org/abs/2101.00001v2', 'http://arxiv.org/abs/2101.00002v1']
+            first = fetcher.fetch(urls)
+            text = " ".join(first[0])
+            assert "efficient attention" in text
+            assert "sparse attention kernels" in text
+            assert "sections/" not in text and "abstract" not in text
+            assert first[1] == ["Single file paper."]
+
+            requests_made = len(server.requests)
+            assert fetcher.fetch(urls) == first
+            assert len(server.requests) == requests_made
+        finally:
+            server.close()
+
+
+def test_missing_paper():
+    """A 404 yields no chunks, is not cached and does not affect other papers"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        server, fetcher = _setup(tmp_dir)
+        try:
+            chunks = fetcher.fetch(['2101.99999v1', '2101.00002v1'])
+            assert chunks == [[], ["Single file paper."]]
+            assert '/e-print/2101.99999v1' in server.requests
+
+            server.requests.clear()
+            fetcher.fetch(['2101.99999v1'])
+            assert '/e-print/2101.99999v1' in server.requests
+        finally:
+            server.close()
+
+
+def test_corrupt_cache_is_a_miss():
+    """Unreadable or malformed cache entries are refetched and rewritten"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        server, fetcher = _setup(tmp_dir)
+        try:
+            expected = fetcher.fetch(['2101.00002v1'])
+            for corrupt in (b'\x81\x91\x01\x01', b'\xcd\x01', b'\x91\x01',
+                            b'\x81\xa6chunks\x92\x01\x02'):
+                for path in glob.glob(os.path.join(tmp_dir, 'cache', '*', '*', 'chunks.*')):
+                    with open(path, 'wb') as f:
+                        f.write(corrupt)
+                assert fetcher.fetch(['2101.00002v1']) == expected
+        finally:
+            server.close()
+
+
+def test_parser_error_not_cached():
+    """A download that fails to parse is retried rather than cached as empty"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        server, fetcher = _setup(tmp_dir)
+        try:
+            path = os.path.join(tmp_dir, 'serve', 'e-print', '2101.00004v1')
+            with open(path, 'wb') as f:
+                f.write(b'\x1f\x8b' + b'not really gzip')
+            assert fetcher.fetch(['2101.00004v1']) == [[]]
+            assert fetcher.cache.load_chunks('2101.00004', 'v1') is None
+        finally:
+            server.close()
+
+
+def test_chunk_size_limit():
+    """Chunks never exceed chunk_size, including carried-over overlap"""
+    text = "\n\n".join(["a" * 1449, "b" * 800, "c" * 800, "d" * 3000])
+    chunks = chunk_text(text, 1500, 200)
+    assert max(len(chunk) for chunk in chunks) <= 1500
+    try:
+        chunk_text("x" * 3000, 100, 100)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("overlap >= chunk_size should be rejected")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing arxiv full text pipeline")
+    print("=" * 60)
+    for test in (test_fetch_chunks_and_cache, test_missing_paper, test_corrupt_cache_is_a_miss,
+                 test_parser_error_not_cached, test_chunk_size_limit):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Test script for the search result model and binary serialization
+
+Uses synthetic arxiv and DuckDuckGo records, so no network access is
+needed. Run directly or with pytest.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from utils import results as result_model
+from utils.results import Paper, Article, _from_record
+
+
+class _CountingRecord:
+    """arxiv.Result stand-in that counts reads of each attribute"""
+
+    def __init__(self):
+        self.reads = {}
+        self._fields = {
+            'title': "Sparse Attention for Long Documents",
+            'authors': [SimpleNamespace(name=f"Author {i}") for i in range(8)],
+            'published': datetime(2024, 3, 1),
+            'summary': "We study sparse attention. " * 40,
+            'entry_id': "http://arxiv.org/abs/2403.00001v1",
+        }
+
+    def __getattr__(self, name):
+        fields = self.__dict__['_fields']
+        if name not in fields:
+            raise AttributeError(name)
+        self.reads[name] = self.reads.get(name, 0) + 1
+        return fields[name]
+
+
+def _expect_value_error(func, *args):
+    """Assert that func(*args) raises ValueError"""
+    try:
+        func(*args)
+    except ValueError:
+        return
+    raise AssertionError(f"{func.__name__}{args!r} did not raise ValueError")
+
+
+def test_lazy_materialization():
+    """Fields are read from the record once, on first access, and are complete"""
+    record = _CountingRecord()
+    paper = Paper.from_arxiv(record)
+    assert record.reads == {}
+
+    assert paper.title == "Sparse Attention for Long Documents"
+    assert paper.title == "Sparse Attention for Long Documents"
+    assert record.reads == {'title': 1}
+
+    assert paper.authors == [f"Author {i}" for i in range(8)]
+    assert paper.summary == "We study sparse attention. " * 40
+    assert record.reads == {'title': 1, 'authors': 1, 'summary': 1}
+    assert paper._record is record
+
+    # Reading the last field releases the record
+    assert paper.published == "2024-03-01"
+    assert paper.url == "http://arxiv.org/abs/2403.00001v1"
+    assert paper._record is None
+    assert paper.to_dict()['authors'] == paper.authors
+
+
+def test_article_fields():
+    """Articles read DuckDuckGo keys and release the dict after to_dict"""
+    article = Article.from_ddgs({'title': "Attention", 'body': "Snippet", 'href': "https://w/a"})
+    assert article.to_dict() == {
+        'title': "Attention", 'body': "Snippet", 'url': "https://w/a", 'source': 'wikipedia'
+    }
+    assert article._record is None
+
+
+def test_round_trip():
+    """dumps/loads preserves papers, articles and chunks"""
+    results = [
+        Paper.from_arxiv(_CountingRecord()),
+        Article(title="Attention", body="Snippet", url="https://w/a"),
+        Paper(title="T", authors=[], published="2020-01-01", summary="", url="u",
+              chunks=["first chunk", "second chunk"]),
+    ]
+    loaded = result_model.loads(result_model.dumps(results))
+    assert [type(result) for result in loaded] == [Paper, Article, Paper]
+    assert [result.to_dict() for result in loaded] == [result.to_dict() for result in results]
+    assert loaded[2].chunks == ["first chunk", "second chunk"]
+
+
+def test_invalid_data():
+    """Truncated or garbage input raises ValueError"""
+    data = result_model.dumps([Article(title="A", body="B", url="C")])
+    for bad in (data[:-1], b'', b'\xc1', b'\x01', b'\x81\x91\x01\x01',
+                b'\xa3\xff\xfe\xfd', b'\x91\x01', b'\x91\x92\x01\xa1x', data + b'\x00'):
+        _expect_value_error(result_model.loads, bad)
+
+
+def test_unknown_type_tag():
+    """_from_record rejects unknown type tags and malformed records"""
+    _expect_value_error(_from_record, [7, "title"])
+    _expect_value_error(_from_record, [])
+    _expect_value_error(_from_record, "not a record")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Testing search result model")
+    print("=" * 60)
+    for test in (test_lazy_materialization, test_article_fields, test_round_trip,
+                 test_invalid_data, test_unknown_type_tag):
+        test()
+        print(f"[OK] {test.__name__}")
@@ -0,0 +1,448 @@
+"""
+Full Text Module
+Downloads arxiv papers concurrently, extracts their text in a process pool
+and splits it into chunks for context assembly.
+
+Raw downloads and extracted chunks are stored in an on-disk cache keyed by
+arxiv ID and version, so a paper that has been seen before costs no network
+and no parsing.
+"""
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+import posixpath
+import re
+import tarfile
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from utils.results import Paper
+from utils.serialization import packb, unpackb
+
+# PDF parsing - Optional import, LaTeX source is used when it is not available
+try:
+    from pypdf import PdfReader
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+    PdfReader = None
+
+ARXIV_SOURCE_URL = "https://arxiv.org/e-print/{arxiv_id}"
+ARXIV_PDF_URL = "https://arxiv.org/pdf/{arxiv_id}"
+
+_ARXIV_ID_RE = re.compile(r'^(?:.*?arxiv\.org/(?:abs|pdf|e-print)/)?(.+?)(v\d+)?(?:\.pdf)?$')
+
+
+def parse_arxiv_id(url: str) -> Tuple[str, Optional[str]]:
+    """
+    Split an arxiv URL or identifier into ID and version
+
+    Args:
+        url: Entry URL (e.g. http://arxiv.org/abs/2101.00001v2) or bare ID
+
+    Returns:
+        Tuple of (arxiv ID, version) where version is None if not present
+    """
+    match = _ARXIV_ID_RE.match(url.strip())
+    if not match:
+        return url, None
+    return match.group(1), match.group(2)
+
+
+_COMMENT_RE = re.compile(r'(?<!\\)%.*')
+_INPUT_RE = re.compile(r'\\(?:input|include)\{([^}]+)\}')
+
+
+def _inline_inputs(source: str, files: Dict[str, str], seen: Tuple[str, ...] = ()) -> str:
+    """Recursively replace \\input and \\include with the files they name"""
+    source = _COMMENT_RE.sub('', source)
+
+    def resolve(match):
+        name = posixpath.normpath(match.group(1).strip())
+        if not name.endswith('.tex'):
+            name = f"{name}.tex"
+        # Missing files and include cycles are dropped
+        if name not in files or name in seen:
+            return ' '
+        return _inline_inputs(files[name], files, seen + (name,))
+
+    return _INPUT_RE.sub(resolve, source)
+
+
+def _strip_latex(source: str) -> str:
+    """Reduce LaTeX source to plain prose"""
+    # Drop comments (but keep escaped percent signs)
+    source = _COMMENT_RE.sub('', source)
+    # Only keep the document body when there is one
+    body = re.search(r'\\begin\{document\}(.*?)(\\end\{document\}|$)', source, re.S)
+    if body:
+        source = body.group(1)
+    # Remove figures, tables and display math entirely
+    source = re.sub(
+        r'\\begin\{(figure|table|equation|align|eqnarray)\*?\}.*?\\end\{\1\*?\}',
+        ' ', source, flags=re.S
+    )
+    # Other environments keep their content but lose the markers
+    source = re.sub(r'\\(?:begin|end)\{[^}]*\}', ' ', source)
+    # Section headings become their own lines
+    source = re.sub(r'\\(?:sub)*section\*?\{([^}]*)\}', r'\n\n\1\n\n', source)
+    # Unwrap formatting commands, keeping their argument
+    source = re.sub(r'\\(?:textbf|textit|emph|text|underline)\{([^}]*)\}', r'\1', source)
+    # Drop citations, references and remaining commands
+    source = re.sub(r'\\(?:cite\w*|ref|eqref|label)\{[^}]*\}', '', source)
+    source = re.sub(r'\\[a-zA-Z]+\*?(\[[^\]]*\])?', ' ', source)
+    source = re.sub(r'\$[^$]*\$', ' ', source)
+    source = re.sub(r'[{}]', '', source).replace('\\%', '%')
+    source = re.sub(r'[ \t]+', ' ', source)
+    return re.sub(r'\n\s*\n+', '\n\n', source).strip()
+
+
+def _extract_pdf(raw: bytes) -> str:
+    """Extract plain text from PDF bytes"""
+    if not PDF_AVAILABLE:
+        return ""
+    reader = PdfReader(io.BytesIO(raw))
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def extract_text(raw: bytes) -> str:
+    """
+    Extract plain text from an arxiv download
+
+    Handles PDFs, gzipped tarballs of LaTeX source and single gzipped
+    or plain .tex files.
+
+    Args:
+        raw: Downloaded bytes
+
+    Returns:
+        Extracted text (empty string if the format is not supported)
+    """
+    if raw.startswith(b'%PDF'):
+        return _extract_pdf(raw)
+
+    if raw[:2] == b'\x1f\x8b':
+        raw = gzip.decompress(raw)
+        if raw.startswith(b'%PDF'):
+            return _extract_pdf(raw)
+
+    try:
+        with tarfile.open(fileobj=io.BytesIO(raw)) as tar:
+            files = {}
+            for member in tar.getmembers():
+                if member.isfile() and member.name.endswith('.tex'):
+                    name = posixpath.normpath(member.name)
+                    files[name] = tar.extractfile(member).read().decode('utf-8', 'replace')
+    except tarfile.TarError:
+        return _strip_latex(raw.decode('utf-8', 'replace'))
+
+    # The main file is the one with \begin{document}; the files it inputs
+    # are inlined into it. Without one, fall back to all files.
+    main = [name for name, source in sorted(files.items()) if '\\begin{document}' in source]
+    if main:
+        return "\n\n".join(
+            _strip_latex(_inline_inputs(files[name], files, (name,))) for name in main
+        )
+    return "\n\n".join(_strip_latex(source) for _, source in sorted(files.items()))
+
+
+def chunk_text(text: str, chunk_size: int = 1500, overlap: int = 200) -> List[str]:
+    """
+    Split text into overlapping chunks on paragraph boundaries
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum characters per chunk
+        overlap: Characters carried over from the end of the previous chunk
+
+    Returns:
+        List of text chunks
+    """
+    if not 0 <= overlap < chunk_size:
+        raise ValueError("overlap must be at least 0 and smaller than chunk_size")
+
+    chunks = []
+    current = ""
+    # Whether current holds text that is not in a chunk yet
+    pending = False
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        combined = f"{current} {paragraph}" if current else paragraph
+        if len(combined) > chunk_size and pending:
+            chunks.append(current)
+            current = current[-overlap:] if overlap else ""
+            combined = f"{current} {paragraph}" if current else paragraph
+        # Text that still does not fit is hard-split
+        while len(combined) > chunk_size:
+            chunks.append(combined[:chunk_size])
+            combined = combined[chunk_size - overlap:]
+        current = combined
+        pending = True
+    if pending:
+        chunks.append(current)
+    return chunks
+
+
+def select_chunks(chunks: List[str], query: str, limit: int = 3) -> List[str]:
+    """
+    Pick the chunks that best match a query, in document order
+
+    Args:
+        chunks: Chunks of one paper
+        query: Search query
+        limit: Maximum number of chunks to return
+
+    Returns:
+        Up to limit chunks, ranked by how many query terms they contain
+    """
+    terms = {term for term in re.findall(r'\w+', query.lower()) if len(term) > 2}
+    scores = [
+        (sum(chunk_lower.count(term) for term in terms), -i)
+        for i, chunk_lower in enumerate(chunk.lower() for chunk in chunks)
+    ]
+    best = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)[:limit]
+    return [chunks[i] for i in sorted(best)]
+
+
+def _extract_chunks(raw: bytes, chunk_size: int, overlap: int) -> List[str]:
+    """Process pool entry point: extract and chunk in one step"""
+    return chunk_text(extract_text(raw), chunk_size, overlap)
+
+
+def _valid_chunks(data) -> Optional[List[str]]:
+    """Return the chunk list from a decoded cache entry, or None if it is corrupt"""
+    chunks = data.get('chunks') if isinstance(data, dict) else None
+    if not isinstance(chunks, list) or not all(isinstance(chunk, str) for chunk in chunks):
+        return None
+    return chunks
+
+
+class FullTextCache:
+    """Content-addressed on-disk cache of raw downloads and extracted chunks"""
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory to store cached files in
+        """
+        self.cache_dir = cache_dir
+
+    def _entry_dir(self, arxiv_id: str, version: str) -> str:
+        """Directory for one paper version, addressed by a hash of its key"""
+        digest = hashlib.sha256(f"{arxiv_id}{version}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def load_chunks(self, arxiv_id: str, version: str) -> Optional[List[str]]:
+        """Return cached chunks or None if the paper has not been processed"""
+        path = os.path.join(self._entry_dir(arxiv_id, version), 'chunks.bin')
+        try:
+            with open(path, 'rb') as f:
+                data = unpackb(f.read())
+        except (OSError, ValueError):
+            return None
+        return _valid_chunks(data)
+
+    def load_raw(self, arxiv_id: str, version: str, name: str = 'raw') -> Optional[bytes]:
+        """Return the cached download or None if it has not been fetched"""
+        path = os.path.join(self._entry_dir(arxiv_id, version), name)
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store_raw(self, arxiv_id: str, version: str, raw: bytes, name: str = 'raw') -> None:
+        """Store a download"""
+        self._write(arxiv_id, version, name, raw)
+
+    def store_chunks(self, arxiv_id: str, version: str, chunks: List[str]) -> None:
+        """Store extracted chunks"""
+        data = packb({'id': arxiv_id, 'version': version, 'chunks': chunks})
+        self._write(arxiv_id, version, 'chunks.bin', data)
+
+    def _write(self, arxiv_id: str, version: str, name: str, data: bytes) -> None:
+        """Write a file atomically so concurrent readers never see partial data"""
+        entry_dir = self._entry_dir(arxiv_id, version)
+        path = os.path.join(entry_dir, name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The cache is best-effort, a failed write only costs a refetch
+            print(f"Error writing full text cache {path}: {e}")
+
+
+class FullTextFetcher:
+    """Fetches, extracts and chunks the full text of arxiv papers"""
+
+    def __init__(self, cache_dir: str, source_url: str = ARXIV_SOURCE_URL,
+                 pdf_url: str = ARXIV_PDF_URL, chunk_size: int = 1500,
+                 overlap: int = 200, max_downloads: int = 4,
+                 max_workers: Optional[int] = None, timeout: float = 30.0):
+        """
+        Initialize the fetcher
+
+        Args:
+            cache_dir: Directory for the on-disk cache
+            source_url: URL template for LaTeX source, with {arxiv_id}
+            pdf_url: URL template for the PDF, used when source has no text
+                and pypdf is installed
+            chunk_size: Maximum characters per chunk
+            overlap: Characters shared between consecutive chunks
+            max_downloads: Maximum concurrent downloads
+            max_workers: Processes used for text extraction
+            timeout: Per-download timeout in seconds
+        """
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("overlap must be at least 0 and smaller than chunk_size")
+        self.cache = FullTextCache(cache_dir)
+        self.source_url = source_url
+        self.pdf_url = pdf_url
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.max_downloads = max_downloads
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def _download(self, url: str) -> Optional[bytes]:
+        """Blocking download, run in a thread"""
+        try:
+            request = urllib.request.Request(url, headers={'User-Agent': 'multi-llm-search-agent'})
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except Exception as e:
+            print(f"Error downloading {url}: {e}")
+            return None
+
+    async def _fetch_raw(self, arxiv_id: str, version: Optional[str], url_template: str,
+                         downloads: ThreadPoolExecutor) -> Optional[bytes]:
+        """Return the raw download, from cache when possible"""
+        name = 'raw' if url_template == self.source_url else 'raw.pdf'
+        if version:
+            raw = self.cache.load_raw(arxiv_id, version, name)
+            if raw is not None:
+                return raw
+
+        loop = asyncio.get_running_loop()
+        raw = await loop.run_in_executor(
+            downloads, self._download, url_template.format(arxiv_id=f"{arxiv_id}{version or ''}")
+        )
+        if raw and version:
+            self.cache.store_raw(arxiv_id, version, raw, name)
+        return raw
+
+    async def _fetch_one(self, arxiv_id: str, version: Optional[str],
+                         downloads: ThreadPoolExecutor,
+                         parsers: ProcessPoolExecutor) -> List[str]:
+        """Download and chunk a single paper that is not in the chunk cache"""
+        loop = asyncio.get_running_loop()
+        chunks = []
+        extracted = False
+        failed = False
+        url_templates = [self.source_url]
+        if PDF_AVAILABLE:
+            url_templates.append(self.pdf_url)
+        for url_template in url_templates:
+            raw = await self._fetch_raw(arxiv_id, version, url_template, downloads)
+            if not raw:
+                failed = True
+                continue
+            try:
+                chunks = await loop.run_in_executor(
+                    parsers, _extract_chunks, raw, self.chunk_size, self.overlap
+                )
+                extracted = True
+            except Exception as e:
+                print(f"Error extracting text for {arxiv_id}{version or ''}: {e}")
+                chunks = []
+                failed = True
+            if chunks:
+                break
+
+        # A paper whose downloads all parsed without text is cached as empty,
+        # so it is not parsed again. Failed downloads and parser errors (for
+        # example a crashed worker) are not cached and are retried next time.
+        if version and (chunks or (extracted and not failed)):
+            self.cache.store_chunks(arxiv_id, version, chunks)
+        return chunks
+
+    async def fetch_async(self, urls: List[str]) -> List[List[str]]:
+        """
+        Fetch and chunk several papers concurrently
+
+        Only versioned IDs are cached, since an unversioned ID may
+        resolve to a newer revision later.
+
+        Args:
+            urls: arxiv entry URLs or IDs
+
+        Returns:
+            List of chunk lists, in the same order as urls
+        """
+        results: List[Optional[List[str]]] = []
+        misses = []
+        for i, url in enumerate(urls):
+            arxiv_id, version = parse_arxiv_id(url)
+            chunks = self.cache.load_chunks(arxiv_id, version) if version else None
+            results.append(chunks)
+            if chunks is None:
+                misses.append((i, arxiv_id, version))
+
+        # Fully cached batches never start a thread or process pool, and
+        # pools are never larger than the number of papers to fetch
+        if misses:
+            max_downloads = min(len(misses), self.max_downloads)
+            max_workers = min(len(misses), self.max_workers or os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_downloads) as downloads, \
+                    ProcessPoolExecutor(max_workers=max_workers) as parsers:
+                fetched = await asyncio.gather(
+                    *(self._fetch_one(arxiv_id, version, downloads, parsers)
+                      for _, arxiv_id, version in misses),
+                    return_exceptions=True
+                )
+            for (i, arxiv_id, version), chunks in zip(misses, fetched):
+                if isinstance(chunks, Exception):
+                    # One failing paper must not drop full text for the rest
+                    print(f"Error fetching full text for {arxiv_id}{version or ''}: {chunks}")
+                    chunks = []
+                results[i] = chunks
+        return results
+
+    def fetch(self, urls: List[str]) -> List[List[str]]:
+        """
+        Synchronous wrapper around fetch_async
+
+        Args:
+            urls: arxiv entry URLs or IDs
+
+        Returns:
+            List of chunk lists, in the same order as urls
+        """
+        if not urls:
+            return []
+        return asyncio.run(self.fetch_async(urls))
+
+    def attach_full_text(self, papers: List[Paper], top_n: int = 2) -> List[Paper]:
+        """
+        Set chunks on the top papers from search_arxiv
+
+        Args:
+            papers: Papers to fetch full text for
+            top_n: Number of papers to fetch full text for
+
+        Returns:
+            The same list, with chunks set on the top papers
+        """
+        top = papers[:top_n]
+        for paper, chunks in zip(top, self.fetch([paper.url for paper in top])):
+            paper.chunks = chunks
+        return papers
@@ -0,0 +1,240 @@
+"""
+Results Module
+Typed search result classes with lazy field materialization
+
+Results keep a reference to the source record they were built from
+(an arxiv.Result or a DuckDuckGo result dict) and only copy a field out
+of it the first time it is read. Once every field has been copied the
+record is released, so it can be freed.
+"""
+from typing import Any, Dict, List, Optional, Union
+from utils.serialization import packb, unpackb
+
+# Record type tags used in the binary format
+_PAPER = 0
+_ARTICLE = 1
+
+
+class Paper:
+    """An arxiv paper"""
+
+    __slots__ = ('_record', '_title', '_authors', '_published', '_summary', '_url', 'chunks')
+
+    source = 'arxiv'
+
+    def __init__(self, record: Any = None, title: Optional[str] = None,
+                 authors: Optional[List[str]] = None, published: Optional[str] = None,
+                 summary: Optional[str] = None, url: Optional[str] = None,
+                 chunks: Optional[List[str]] = None):
+        """
+        Initialize a paper
+
+        Args:
+            record: arxiv.Result to read fields from on first access
+            title: Paper title
+            authors: All author names
+            published: Publication date (YYYY-MM-DD)
+            summary: Full abstract
+            url: arxiv entry URL
+            chunks: Full text chunks, if fetched
+        """
+        self._record = record
+        self._title = title
+        self._authors = authors
+        self._published = published
+        self._summary = summary
+        self._url = url
+        self.chunks = chunks or []
+
+    @classmethod
+    def from_arxiv(cls, result: Any) -> 'Paper':
+        """Wrap an arxiv.Result without copying any of its fields"""
+        return cls(record=result)
+
+    def _release_record(self) -> None:
+        """Drop the source record once every field has been copied out of it"""
+        if None not in (self._title, self._authors, self._published, self._summary, self._url):
+            self._record = None
+
+    @property
+    def title(self) -> str:
+        """Paper title"""
+        if self._title is None:
+            self._title = self._record.title
+            self._release_record()
+        return self._title
+
+    @property
+    def authors(self) -> List[str]:
+        """All author names"""
+        if self._authors is None:
+            self._authors = [author.name for author in self._record.authors]
+            self._release_record()
+        return self._authors
+
+    @property
+    def published(self) -> str:
+        """Publication date (YYYY-MM-DD)"""
+        if self._published is None:
+            self._published = self._record.published.strftime('%Y-%m-%d')
+            self._release_record()
+        return self._published
+
+    @property
+    def summary(self) -> str:
+        """Full abstract"""
+        if self._summary is None:
+            self._summary = self._record.summary
+            self._release_record()
+        return self._summary
+
+    @property
+    def url(self) -> str:
+        """arxiv entry URL"""
+        if self._url is None:
+            self._url = self._record.entry_id
+            self._release_record()
+        return self._url
+
+    def to_record(self) -> list:
+        """Return the fields as a list for binary serialization"""
+        return [_PAPER, self.title, self.authors, self.published,
+                self.summary, self.url, self.chunks]
+
+    def to_dict(self) -> Dict:
+        """Return the fields as a plain dictionary"""
+        return {
+            'title': self.title,
+            'authors': self.authors,
+            'published': self.published,
+            'summary': self.summary,
+            'url': self.url,
+            'chunks': self.chunks,
+            'source': self.source
+        }
+
+    def __repr__(self) -> str:
+        return f"Paper(title={self.title!r}, url={self.url!r})"
+
+
+class Article:
+    """A Wikipedia article"""
+
+    __slots__ = ('_record', '_title', '_body', '_url')
+
+    source = 'wikipedia'
+
+    def __init__(self, record: Optional[Dict] = None, title: Optional[str] = None,
+                 body: Optional[str] = None, url: Optional[str] = None):
+        """
+        Initialize an article
+
+        Args:
+            record: DuckDuckGo result dictionary to read fields from on first access
+            title: Article title
+            body: Article snippet
+            url: Article URL
+        """
+        self._record = record
+        self._title = title
+        self._body = body
+        self._url = url
+
+    @classmethod
+    def from_ddgs(cls, result: Dict) -> 'Article':
+        """Wrap a DuckDuckGo result without copying any of its fields"""
+        return cls(record=result)
+
+    def _release_record(self) -> None:
+        """Drop the source record once every field has been copied out of it"""
+        if None not in (self._title, self._body, self._url):
+            self._record = None
+
+    @property
+    def title(self) -> str:
+        """Article title"""
+        if self._title is None:
+            self._title = self._record.get('title', '')
+            self._release_record()
+        return self._title
+
+    @property
+    def body(self) -> str:
+        """Article snippet"""
+        if self._body is None:
+            self._body = self._record.get('body', '')
+            self._release_record()
+        return self._body
+
+    @property
+    def url(self) -> str:
+        """Article URL"""
+        if self._url is None:
+            self._url = self._record.get('href', '')
+            self._release_record()
+        return self._url
+
+    def to_record(self) -> list:
+        """Return the fields as a list for binary serialization"""
+        return [_ARTICLE, self.title, self.body, self.url]
+
+    def to_dict(self) -> Dict:
+        """Return the fields as a plain dictionary"""
+        return {
+            'title': self.title,
+            'body': self.body,
+            'url': self.url,
+            'source': self.source
+        }
+
+    def __repr__(self) -> str:
+        return f"Article(title={self.title!r}, url={self.url!r})"
+
+
+Result = Union[Paper, Article]
+
+
+def _from_record(record: list) -> Result:
+    """Rebuild a result from its serialized field list"""
+    if not isinstance(record, list) or not record:
+        raise ValueError(f"Invalid result record {record!r}")
+    if record[0] == _PAPER:
+        _, title, authors, published, summary, url, chunks = record
+        return Paper(title=title, authors=authors, published=published,
+                     summary=summary, url=url, chunks=chunks)
+    if record[0] == _ARTICLE:
+        _, title, body, url = record
+        return Article(title=title, body=body, url=url)
+    raise ValueError(f"Unknown result type {record[0]!r}")
+
+
+def dumps(results: List[Result]) -> bytes:
+    """
+    Serialize results to compact binary
+
+    Args:
+        results: Papers and/or articles
+
+    Returns:
+        msgpack encoded bytes
+    """
+    return packb([result.to_record() for result in results])
+
+
+def loads(data: bytes) -> List[Result]:
+    """
+    Deserialize results produced by dumps
+
+    Args:
+        data: Bytes from dumps
+
+    Returns:
+        List of papers and/or articles
+
+    Raises:
+        ValueError: If the data is malformed or holds an unknown result type
+    """
+    records = unpackb(data)
+    if not isinstance(records, list):
+        raise ValueError("Serialized results must be a list")
+    return [_from_record(record) for record in records]
@@ -5,14 +5,28 @@ Uses DuckDuckGo to search arxiv and Wikipedia
 from ddgs import DDGS
 from typing import List, Dict, Optional
 import arxiv as arxiv_lib
+from config import settings
+from utils.full_text import FullTextFetcher
+from utils.results import Paper, Article
 
 class SearchEngine:
     """Handles searching on arxiv and Wikipedia"""
     
-    def __init__(self):
+    def __init__(self, full_text_fetcher: Optional[FullTextFetcher] = None):
+        """
+        Initialize the search engine
+        
+        Args:
+            full_text_fetcher: Fetcher for arxiv full text (built from settings if omitted)
+        """
         self.ddgs = DDGS()
+        self.full_text_fetcher = full_text_fetcher or FullTextFetcher(
+            settings.FULL_TEXT_CACHE_DIR,
+            chunk_size=settings.FULL_TEXT_CHUNK_SIZE,
+            overlap=settings.FULL_TEXT_CHUNK_OVERLAP
+        )
     
-    def search_arxiv(self, query: str, max_results: int = 5) -> List[Dict]:
+    def search_arxiv(self, query: str, max_results: int = 5) -> List[Paper]:
         """
         Search arxiv papers using arxiv API
         
@@ -21,7 +35,7 @@ class SearchEngine:
             max_results: Maximum number of results
             
         Returns:
-            List of paper information
+            List of papers
         """
         try:
             papers = []
@@ -34,21 +48,14 @@ class SearchEngine:
             for i, paper in enumerate(search.results()):
                 if i >= max_results:
                     break
-                papers.append({
-                    'title': paper.title,
-                    'authors': [author.name for author in paper.authors][:3],  # First 3 authors
-                    'published': paper.published.strftime('%Y-%m-%d'),
-                    'summary': paper.summary[:300],  # Truncate summary
-                    'url': paper.entry_id,
-                    'source': 'arxiv'
-                })
+                papers.append(Paper.from_arxiv(paper))
             
             return papers
         except Exception as e:
             # arxiv API may have issues, but we'll continue with other sources
             return []
     
-    def search_wikipedia(self, query: str, max_results: int = 5) -> List[Dict]:
+    def search_wikipedia(self, query: str, max_results: int = 5) -> List[Article]:
         """
         Search Wikipedia using DuckDuckGo
         
@@ -57,7 +64,7 @@ class SearchEngine:
             max_results: Maximum number of results
             
         Returns:
-            List of Wikipedia article information
+            List of Wikipedia articles
         """
         try:
             results = []
@@ -66,19 +73,33 @@ class SearchEngine:
             ddgs_results = self.ddgs.text(search_query, max_results=max_results)
             
             for result in ddgs_results:
-                results.append({
-                    'title': result.get('title', ''),
-                    'body': result.get('body', ''),
-                    'url': result.get('href', ''),
-                    'source': 'wikipedia'
-                })
+                results.append(Article.from_ddgs(result))
             
             return results
         except Exception as e:
             print(f"Error searching Wikipedia: {e}")
             return []
     
-    def combined_search(self, query: str, arxiv_max: int = 3, wiki_max: int = 3) -> Dict:
+    def fetch_full_text(self, papers: List[Paper], top_n: int = 2) -> List[Paper]:
+        """
+        Attach full text chunks to the top arxiv papers
+        
+        Args:
+            papers: Results from search_arxiv
+            top_n: Number of papers to fetch full text for
+            
+        Returns:
+            The same papers, with chunks set on the top ones
+        """
+        try:
+            return self.full_text_fetcher.attach_full_text(papers, top_n)
+        except Exception as e:
+            # Full text is an optional extra, summaries are still usable
+            print(f"Error fetching arxiv full text: {e}")
+            return papers
+    
+    def combined_search(self, query: str, arxiv_max: int = 3, wiki_max: int = 3,
+                        full_text: Optional[bool] = None) -> Dict:
         """
         Perform combined search on both arxiv and Wikipedia
         
@@ -86,12 +107,21 @@ class SearchEngine:
             query: Search query
             arxiv_max: Maximum arxiv results
             wiki_max: Maximum Wikipedia results
+            full_text: Whether to fetch full text for the top arxiv papers
+                (defaults to settings.FULL_TEXT_ENABLED)
             
         Returns:
             Dictionary containing results from both sources
         """
+        if full_text is None:
+            full_text = settings.FULL_TEXT_ENABLED
+        
+        papers = self.search_arxiv(query, arxiv_max)
+        if full_text:
+            papers = self.fetch_full_text(papers, settings.FULL_TEXT_TOP_N)
+        
         return {
-            'arxiv': self.search_arxiv(query, arxiv_max),
+            'arxiv': papers,
             'wikipedia': self.search_wikipedia(query, wiki_max),
             'query': query
         }
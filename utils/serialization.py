@@ -0,0 +1,42 @@
+"""
+Serialization Module
+Compact binary encoding of search results in the msgpack format
+"""
+from typing import Any
+import msgpack
+
+
+def packb(obj: Any) -> bytes:
+    """
+    Serialize an object to msgpack bytes
+
+    Args:
+        obj: Object made of None, bool, int, float, str, bytes, lists and dicts
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        TypeError: If obj contains an unsupported type
+        OverflowError: If an integer does not fit in 64 bits
+    """
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def unpackb(data: bytes) -> Any:
+    """
+    Deserialize msgpack bytes
+
+    Args:
+        data: Bytes produced by packb
+
+    Returns:
+        Decoded object (arrays are returned as lists)
+
+    Raises:
+        ValueError: If the data is truncated or malformed
+    """
+    try:
+        return msgpack.unpackb(data, raw=False)
+    except (ValueError, TypeError, msgpack.UnpackException) as e:
+        raise ValueError(f"Invalid serialized data: {e}") from e